@@ -1,212 +1,412 @@
-from flask import Flask, request, render_template_string
-import io, base64
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-
+from flask import Flask, Response, request, url_for, jsonify, abort, stream_with_context, g
+import io, os, csv, json, time, hashlib, itertools
+from contextlib import contextmanager
+from functools import lru_cache
+from markupsafe import Markup, escape
+import catalog
+import chart
+import engine
+import metrics
 
 
 app = Flask(__name__)
 
-# 각 주류별 정보: 이름, 용량, 도수, 단위당 알콜 그램
-alcohol_info = {
-    'soju': {
-        'name': "소주",
-        'volume': "360 mL",
-        'abv': "20%",
-        'grams': 56.8
-    },
-    'beer': {
-        'name': "맥주",
-        'volume': "500 mL",
-        'abv': "4.5%",
-        'grams': 17.75
-    },
-    'wine': {
-        'name': "와인",
-        'volume': "150 mL",
-        'abv': "12%",
-        'grams': 14.2
-    },
-    'makgeolli': {
-        'name': "막걸리",
-        'volume': "300 mL",
-        'abv': "6%",
-        'grams': 14.2
-    },
-    'whiskey': {
-        'name': "양주",
-        'volume': "30 mL",
-        'abv': "40%",
-        'grams': 9.5
-    }
-}
+# 그래프 렌더링 프로세스 풀: 워커 수(0이면 요청 스레드에서 렌더링)와 대기열 길이
+chart.configure_pool(
+    int(os.environ.get('CALCUL_RENDER_WORKERS', 0)),
+    int(os.environ.get('CALCUL_RENDER_QUEUE', 4)),
+)
+
+# 워커 프로세스들의 지표를 합쳐서 출력하기 위한 공유 디렉터리 (gunicorn.conf.py에서 설정)
+metrics.configure(os.environ.get('CALCUL_METRICS_DIR'))
+
+# 주류 카탈로그 파일 (JSON/CSV). 없으면 기본 카탈로그, 파일이 바뀌면 자동으로 다시 읽음
+catalog.configure(os.environ.get('CALCUL_CATALOG'))
+
+# 처벌 기준 안내 (고정 문구이므로 미리 만들어 둠)
+PENALTY_LEGEND = (
+    "<p>처벌 기준 (예시):</p>"
+    "<ul>"
+    "<li>BAC 0.03% 미만: 운전해도 괜찮습니다.</li>"
+    "<li>BAC 0.03% 이상 ~ 0.08% 미만: 징역 1년, 벌금 200만원, 면허 취소 6개월</li>"
+    "<li>BAC 0.08% 이상 ~ 0.15% 미만: 징역 2년, 벌금 500만원, 면허 취소 1년</li>"
+    "<li>BAC 0.15% 이상: 징역 3년, 벌금 1000만원, 면허 취소 2년</li>"
+    "</ul>"
+)
+
+# HTML 템플릿: 폼에는 이전 입력값이 남도록 하고, 그래프 이미지를 표시
+PAGE_HTML = '''
+<!doctype html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>음주 측정기</title>
+</head>
+<body>
+    <h1>음주 측정기</h1>
+    <form method="post">
+        <label for="gender">성별:</label>
+        <select name="gender" id="gender">
+            <option value="male" {% if prev_data.get('gender') == 'male' %}selected{% endif %}>남성</option>
+            <option value="female" {% if prev_data.get('gender') == 'female' %}selected{% endif %}>여성</option>
+        </select>
+        <br><br>
+        
+        <label for="weight">몸무게 (kg):</label>
+        <input type="number" name="weight" id="weight" step="0.1" required value="{{ prev_data.get('weight', '') }}">
+        <br><br>
+        
+        <label for="hours">음주 후 경과 시간 (시간):</label>
+        <input type="number" name="hours" id="hours" step="0.1" required value="{{ prev_data.get('hours', '') }}">
+        <br><br>
+        
+        <h3>각 주류별 섭취량</h3>
+        {% for key, label in drink_labels %}
+            {{ label }}
+            <input type="number" name="{{ key }}" id="{{ key }}" value="{{ prev_data.get(key, 0) }}">
+            <br><br>
+        {% endfor %}
+        
+        <input type="submit" value="측정하기">
+    </form>
+    
+    <hr>
+    <div>
+        <h2>입력 내역</h2>
+        {{ details | safe }}
+        <h2>측정 결과</h2>
+        {{ result | safe }}
+    </div>
+    
+    {% if graph_url %}
+    <hr>
+    <div>
+        <h2>시간에 따른 혈중 알콜 농도 변화</h2>
+        <img src="{{ graph_url }}" alt="BAC over time graph">
+    </div>
+    {% endif %}
+</body>
+</html>
+'''
+
+# 템플릿은 시작 시 한 번만 컴파일
+PAGE = app.jinja_env.from_string(PAGE_HTML)
+
+
+# 카탈로그별로 미리 만들어 두는 페이지 조각 (카탈로그가 다시 로드되면 새로 만듦)
+# - 주류별 입력칸 라벨: 입력값만 요청마다 바뀌므로 라벨은 미리 렌더링
+# - 입력값이 없는 GET 페이지: 항상 같으므로 미리 렌더링해 두고 ETag로 재검증
+@lru_cache(maxsize=1)
+def _page_parts(cat):
+    drink_labels = [
+        (key, Markup(
+            f'<label for="{escape(key)}">{escape(cat.names[i])} ({escape(cat.volume_text(i))}, {escape(cat.abv_text(i))}):</label>'
+        ))
+        for i, key in enumerate(cat.keys)
+    ]
+    get_page = PAGE.render(result="", details="", drink_labels=drink_labels, prev_data={}, graph_url=None).encode("utf-8")
+    return drink_labels, get_page, hashlib.sha1(get_page).hexdigest()[:16]
+
+
+def _get_page():
+    _, get_page, etag = _page_parts(catalog.current())
+    response = Response(get_page, mimetype='text/html')
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+# 요청 단계별 소요 시간: /metrics 히스토그램에 기록하고 Server-Timing 헤더로도 보냄
+@contextmanager
+def _stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe('calcul_stage_seconds', (('stage', name),), elapsed)
+        g.timings.append((name, elapsed))
+
+
+@app.before_request
+def _start_timer():
+    g.start = time.perf_counter()
+    g.timings = []
+
+
+@app.after_request
+def _record_timing(response):
+    start = g.start
+    elapsed = time.perf_counter() - start
+    labels = (('endpoint', request.endpoint or 'unknown'),)
+    if response.status_code == 304:
+        metrics.inc('calcul_events_total', (('event', 'not_modified'),) + labels)
+    timings = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in g.timings]
+    if g.get('streaming'):
+        # 스트리밍 응답(/api/batch)은 본문을 보내면서 계산하므로 지금은 아직 끝나지 않음
+        # 응답을 다 보내고 닫힐 때 기록하고, 헤더에는 전체 시간을 넣지 않음
+        response.call_on_close(
+            lambda: metrics.observe('calcul_request_seconds', labels, time.perf_counter() - start)
+        )
+    else:
+        metrics.observe('calcul_request_seconds', labels, elapsed)
+        timings.append(f"total;dur={elapsed * 1000:.3f}")
+    if timings:
+        response.headers['Server-Timing'] = ", ".join(timings)
+    return response
+
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
-    result = ""
-    details = ""
-    graph_img = None  # 그래프 이미지 (base64 문자열)
-    # 폼 데이터 유지용 딕셔너리
-    prev_data = {}
+    # 입력값이 없는 GET은 미리 렌더링한 페이지로 응답
+    if request.method == 'GET':
+        return _get_page()
 
-    if request.method == 'POST':
+    with _stage('parse'):
         # 폼에서 입력값 받기
         gender = request.form.get('gender')
         weight = float(request.form.get('weight'))
         hours = float(request.form.get('hours'))
         
-        # 각 주류별 섭취량 및 총 알콜 계산
-        counts = {}
-        total_alcohol = 0
-        details_list = []
-        for key in alcohol_info:
-            count = int(request.form.get(key, 0))
-            counts[key] = count
-            grams = count * alcohol_info[key]['grams']
-            total_alcohol += grams
-            details_list.append(
-                f"{alcohol_info[key]['name']}: {count}회 ({alcohol_info[key]['volume']}, {alcohol_info[key]['abv']}) → {grams:.2f} g"
-            )
+        # 각 주류별 섭취량: 제출된 필드 중 카탈로그에 있는 주류만 확인 (빈 칸/0회는 건너뜀)
+        cat = catalog.current()
+        counts = {
+            key: int(value)
+            for key, value in request.form.items()
+            if key in cat.index and value not in ('', '0')
+        }
         
         # 폼에 다시 출력하기 위해 입력값 보존
         prev_data = {
             'gender': gender,
             'weight': weight,
             'hours': hours,
-            'soju': counts.get('soju', 0),
-            'beer': counts.get('beer', 0),
-            'wine': counts.get('wine', 0),
-            'makgeolli': counts.get('makgeolli', 0),
-            'whiskey': counts.get('whiskey', 0)
+            **counts
         }
-        
-        # 성별에 따른 알콜 분포율: 남성 0.68, 여성 0.55
-        r = 0.68 if gender == 'male' else 0.55
-        
-        # 초기 BAC (마신 직후, 소모 전)
-        initial_bac = (total_alcohol / (weight * 1000 * r)) * 100
-        # 사용자가 입력한 경과 시간에 따른 현재 BAC (음수가 되면 0으로 처리)
-        bac = max(initial_bac - 0.015 * hours, 0)
-        
-        # 처벌 기준 (예시)
-        # BAC < 0.03: 운전해도 괜찮음  
-        # 0.03 <= BAC < 0.08: 징역 1년, 벌금 200만원, 면허 취소 6개월  
-        # 0.08 <= BAC < 0.15: 징역 2년, 벌금 500만원, 면허 취소 1년  
-        # BAC >= 0.15: 징역 3년, 벌금 1000만원, 면허 취소 2년
-        if bac < 0.03:
-            penalty = "운전해도 괜찮습니다."
-        elif bac < 0.08:
-            penalty = "징역 1년, 벌금 200만원, 면허 취소 6개월"
-        elif bac < 0.15:
-            penalty = "징역 2년, 벌금 500만원, 면허 취소 1년"
-        else:
-            penalty = "징역 3년, 벌금 1000만원, 면허 취소 2년"
-        
+    
+    # BAC 및 처벌 기준 계산 (engine 모듈)
+    with _stage('calc'):
+        res = engine.compute_bac(gender, weight, hours, counts, cat)
+    
+    with _stage('format'):
+        details_list = []
+        for key, grams in res.grams.items():
+            i = cat.index[key]
+            details_list.append(
+                # 카탈로그는 외부 파일에서 오므로 이름 등은 escape (details는 | safe로 출력)
+                f"{escape(cat.names[i])}: {counts[key]}회 ({escape(cat.volume_text(i))}, {escape(cat.abv_text(i))}) → {grams:.2f} g"
+            )
         details = "<ul>" + "".join(f"<li>{item}</li>" for item in details_list) + "</ul>"
         result = (
-            f"<p>총 알콜 섭취량: {total_alcohol:.2f} g</p>"
-            f"<p>마신 직후 BAC: {initial_bac:.3f}%</p>"
-            f"<p>음주 후 {hours:.1f}시간 경과 시 BAC: {bac:.3f}%</p>"
-            "<p>처벌 기준 (예시):</p>"
-            "<ul>"
-            "<li>BAC 0.03% 미만: 운전해도 괜찮습니다.</li>"
-            "<li>BAC 0.03% 이상 ~ 0.08% 미만: 징역 1년, 벌금 200만원, 면허 취소 6개월</li>"
-            "<li>BAC 0.08% 이상 ~ 0.15% 미만: 징역 2년, 벌금 500만원, 면허 취소 1년</li>"
-            "<li>BAC 0.15% 이상: 징역 3년, 벌금 1000만원, 면허 취소 2년</li>"
-            "</ul>"
-            f"<p>최종 결과: {penalty}</p>"
+            f"<p>총 알콜 섭취량: {res.total_alcohol:.2f} g</p>"
+            f"<p>마신 직후 BAC: {res.initial_bac:.3f}%</p>"
+            f"<p>음주 후 {hours:.1f}시간 경과 시 BAC: {res.bac:.3f}%</p>"
+            + PENALTY_LEGEND
+            + f"<p>최종 결과: {res.penalty_text}</p>"
         )
         
-        # 시간에 따른 BAC 변화 그래프 생성
-        # 안전 운전 기준: 0.03%
-        safe_threshold = 0.03
-        if initial_bac > safe_threshold:
-            # BAC가 safe_threshold 이하로 떨어질 때까지 필요한 시간 (시간 단위)
-            time_to_safe = (initial_bac - safe_threshold) / 0.015
-        else:
-            time_to_safe = 0
-        
         # 그래프를 좀 더 보기 좋게 하기 위해 약간의 여유 시간 추가 (최소 1시간)
-        T_end = time_to_safe + 1 if time_to_safe > 0 else 1
-        times = np.linspace(0, T_end, 100)
-        bac_values = [max(initial_bac - 0.015 * t, 0) for t in times]
+        T_end = res.time_to_safe + 1 if res.time_to_safe > 0 else 1
         
-        # matplotlib를 이용하여 그래프 생성
-        plt.figure(figsize=(6,4))
-        plt.plot(times, bac_values, label="BAC")
-        plt.axhline(y=safe_threshold, color='green', linestyle='--', label="Safe Limit (0.03%)")
-        plt.xlabel("Time (hours)")
-        plt.ylabel("Blood Alcohol Concentration (%)")
-        plt.title("BAC over Time")
-        plt.legend()
-        plt.grid(True)
-        
-        # 그래프 이미지를 메모리 버퍼에 저장한 후 base64 인코딩
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png", bbox_inches="tight")
+        # 그래프는 별도 엔드포인트에서 제공 (입력값의 해시로 주소가 정해지므로 브라우저/CDN 캐시 가능)
+        # /graph가 받지 않는 범위(음수 몸무게, 지나친 섭취량 등)면 그래프 대신 안내 문구
+        q_bac, q_end = chart.quantize(res.initial_bac, T_end)
+        if chart.in_range(q_bac, q_end):
+            graph_url = url_for('graph', bac=q_bac, t_end=q_end, v=chart.content_hash(q_bac, q_end))
+        else:
+            graph_url = None
+            result += "<p>입력값이 그래프로 표시할 수 있는 범위를 벗어났습니다.</p>"
+
+    with _stage('template'):
+        drink_labels, _, _ = _page_parts(cat)
+        return PAGE.render(result=result, details=details, drink_labels=drink_labels, prev_data=prev_data, graph_url=graph_url)
+
+
+# 그래프/곡선 응답은 입력값만으로 결정되므로 오래 캐시해도 됨
+CACHE_MAX_AGE = 365 * 24 * 3600
+
+# 그래프 렌더링이 과부하일 때 PNG 재요청까지 기다릴 시간 (초)
+RETRY_AFTER = 1
+
+# /api/curve 응답의 소수점 자릿수 (시간, BAC)
+TIME_DIGITS = 3
+BAC_DIGITS = 5
+
+
+def _curve_args():
+    try:
+        initial_bac = float(request.args['bac'])
+        T_end = float(request.args['t_end'])
+    except (KeyError, ValueError):
+        abort(400)
+    if not chart.in_range(initial_bac, T_end):
+        abort(400)
+    return chart.quantize(initial_bac, T_end)
+
+
+def _cacheable(response, etag):
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = CACHE_MAX_AGE
+    response.cache_control.immutable = True
+    # If-None-Match가 일치하면 본문 없이 304 응답
+    return response.make_conditional(request)
+
+
+@app.route('/graph')
+def graph():
+    initial_bac, T_end = _curve_args()
+    fmt = request.args.get('fmt', 'svg')
+    if fmt not in chart.FORMATS:
+        abort(400)
+    etag = chart.content_hash(initial_bac, T_end, fmt)
+    if etag in request.if_none_match:
+        return _cacheable(Response(status=304), etag)
+    try:
+        with _stage('chart'):
+            body = chart.render_bac_chart(initial_bac, T_end, fmt)
+    except chart.Overloaded:
+        metrics.inc('calcul_events_total', (('event', 'chart_degraded'), ('format', fmt)))
+        return _degraded_graph(initial_bac, T_end, fmt)
+    return _cacheable(Response(body, mimetype=chart.FORMATS[fmt]), etag)
+
+
+def _degraded_graph(initial_bac, T_end, fmt):
+    # 과부하 시: SVG는 간이 그래프로 대신하고 PNG는 나중에 다시 요청하도록 함 (둘 다 캐시 금지)
+    if fmt == 'svg':
+        response = Response(chart.fallback_svg(initial_bac, T_end), mimetype=chart.FORMATS['svg'])
+    else:
+        response = Response(status=503)
+        response.headers['Retry-After'] = str(RETRY_AFTER)
+    response.cache_control.no_store = True
+    return response
+
+
+@app.route('/api/curve')
+def api_curve():
+    initial_bac, T_end = _curve_args()
+    etag = chart.content_hash(initial_bac, T_end, 'json')
+    if etag in request.if_none_match:
+        return _cacheable(Response(status=304), etag)
+    # 곡선은 꺾은선이므로 꺾은점만 보내면 클라이언트에서 그대로 그릴 수 있음
+    times, bac_values = chart.bac_curve(initial_bac, T_end)
+    return _cacheable(jsonify(
+        initial_bac=initial_bac,
+        T_end=T_end,
+        safe_threshold=chart.SAFE_THRESHOLD,
+        times=[round(t, TIME_DIGITS) for t in times],
+        bac=[round(b, BAC_DIGITS) for b in bac_values],
+        crossings={
+            f"{threshold:g}": round(engine.time_below(initial_bac, threshold), TIME_DIGITS)
+            for threshold in engine.PENALTY_THRESHOLDS
+        },
+        time_to_zero=round(initial_bac / engine.ELIMINATION_RATE, TIME_DIGITS),
+    ), etag)
+
+
+def _batch_rows(content_type):
+    # CSV/NDJSON은 한 줄씩 읽어 요청 본문 전체를 메모리에 올리지 않음
+    if content_type == 'text/csv':
+        return csv.DictReader(io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline=''))
+    if content_type == 'application/x-ndjson':
+        return (json.loads(line) for line in request.stream if line.strip())
+    rows = request.get_json(silent=True)
+    if not isinstance(rows, list):
+        abort(400)
+    return rows
+
+
+# 대량 계산 입력이 잘못되었을 때 나는 예외 (빈 값, 숫자가 아닌 값, 잘못된 CSV/JSON 행 등)
+BATCH_ERRORS = (KeyError, ValueError, TypeError, AttributeError, csv.Error)
+
+
+def _batch_error(e):
+    return f"missing field {e}" if isinstance(e, KeyError) else str(e)
+
+
+def _csv_chunks(results):
+    # 헤더와 데이터 행을 같은 writer 설정으로 써서 줄바꿈을 맞춤
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+
+    def flush():
+        data = buf.getvalue()
         buf.seek(0)
-        graph_img = base64.b64encode(buf.getvalue()).decode("utf-8")
-        plt.close()  # plt 객체 닫기
-
-    # HTML 템플릿: 폼에는 이전 입력값이 남도록 하고, 그래프 이미지를 표시
-    html = '''
-    <!doctype html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <title>음주 측정기</title>
-    </head>
-    <body>
-        <h1>음주 측정기</h1>
-        <form method="post">
-            <label for="gender">성별:</label>
-            <select name="gender" id="gender">
-                <option value="male" {% if prev_data.get('gender') == 'male' %}selected{% endif %}>남성</option>
-                <option value="female" {% if prev_data.get('gender') == 'female' %}selected{% endif %}>여성</option>
-            </select>
-            <br><br>
-            
-            <label for="weight">몸무게 (kg):</label>
-            <input type="number" name="weight" id="weight" step="0.1" required value="{{ prev_data.get('weight', '') }}">
-            <br><br>
-            
-            <label for="hours">음주 후 경과 시간 (시간):</label>
-            <input type="number" name="hours" id="hours" step="0.1" required value="{{ prev_data.get('hours', '') }}">
-            <br><br>
-            
-            <h3>각 주류별 섭취량</h3>
-            {% for key, info in alcohol_info.items() %}
-                <label for="{{ key }}">
-                    {{ info.name }} ({{ info.volume }}, {{ info.abv }}):
-                </label>
-                <input type="number" name="{{ key }}" id="{{ key }}" value="{{ prev_data.get(key, 0) }}">
-                <br><br>
-            {% endfor %}
-            
-            <input type="submit" value="측정하기">
-        </form>
-        
-        <hr>
-        <div>
-            <h2>입력 내역</h2>
-            {{ details | safe }}
-            <h2>측정 결과</h2>
-            {{ result | safe }}
-        </div>
-        
-        {% if graph_img %}
-        <hr>
-        <div>
-            <h2>시간에 따른 혈중 알콜 농도 변화</h2>
-            <img src="data:image/png;base64,{{ graph_img }}" alt="BAC over time graph">
-        </div>
-        {% endif %}
-    </body>
-    </html>
-    '''
-    return render_template_string(html, result=result, details=details, alcohol_info=alcohol_info, prev_data=prev_data, graph_img=graph_img)
+        buf.truncate()
+        return data
+
+    writer.writerow(engine.BATCH_COLUMNS)
+    yield flush()
+    row = 0
+    try:
+        for batch in results:
+            writer.writerows(zip(*(batch[col].tolist() for col in engine.BATCH_COLUMNS)))
+            row += len(batch['bac'])
+            yield flush()
+    except BATCH_ERRORS as e:
+        writer.writerow(('error', row, _batch_error(e)))
+        yield flush()
+
+
+def _ndjson_chunks(results):
+    row = 0
+    try:
+        for batch in results:
+            yield "".join(
+                json.dumps(dict(zip(engine.BATCH_COLUMNS, values)), allow_nan=False) + "\n"
+                for values in zip(*(batch[col].tolist() for col in engine.BATCH_COLUMNS))
+            )
+            row += len(batch['bac'])
+    except BATCH_ERRORS as e:
+        yield json.dumps({'error': _batch_error(e), 'row': row}) + "\n"
+
+
+# 대량 계산: 행마다 gender, weight, hours와 주류별 섭취 횟수
+# CSV 입력은 CSV로, JSON 배열/NDJSON 입력은 NDJSON으로 결과를 스트리밍
+# 첫 묶음(engine.BATCH_CHUNK행)에 잘못된 행이 있으면 400으로 응답
+# 그 뒤 묶음에서 잘못된 행이 나오면 이미 200을 보냈으므로 마지막 줄에 오류를 쓰고 끝냄:
+#   CSV는 error,<row>,<메시지>, NDJSON은 {"error": <메시지>, "row": <row>}
+#   row는 결과를 보낸 행 수 (0부터 센 입력 행 번호로 row행부터는 계산하지 않음)
+@app.route('/api/batch', methods=['POST'])
+def api_batch():
+    content_type = request.mimetype
+    results = engine.iter_bac_batch(_batch_rows(content_type))
+    # 첫 묶음은 미리 계산해서 잘못된 입력이면 스트리밍 시작 전에 400으로 응답
+    try:
+        first = next(results, None)
+    except BATCH_ERRORS:
+        abort(400)
+    results = itertools.chain([first] if first is not None else [], results)
+    g.streaming = True
+    if content_type == 'text/csv':
+        return Response(stream_with_context(_csv_chunks(results)), mimetype='text/csv')
+    return Response(stream_with_context(_ndjson_chunks(results)), mimetype='application/x-ndjson')
+
+
+# 그래프 캐시 적중/실패 횟수는 lru_cache 통계에서 읽음
+def _chart_cache_counters():
+    info = chart.cache_info()
+    return [
+        ('calcul_cache_requests_total', (('cache', 'chart'), ('result', 'hit')), info.hits),
+        ('calcul_cache_requests_total', (('cache', 'chart'), ('result', 'miss')), info.misses),
+    ]
+
+
+metrics.add_collector(_chart_cache_counters)
+
+
+# Prometheus 형식 지표 (CALCUL_METRICS_DIR이 있으면 모든 워커 프로세스의 합계)
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+# 무거운 모듈(NumPy, 렌더링 프로세스 풀을 쓰지 않으면 matplotlib와 폰트 캐시도)을 미리 준비하는 훅
+# 평소에는 첫 그래프/대량 계산 요청 때 불러오며, preload 모드에서는 fork 전에 마스터가 호출 (gunicorn.conf.py)
+def warm_up():
+    chart.warm_up()
+
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # 개발 서버 (운영 환경은 gunicorn.conf.py 참고). 디버거는 FLASK_DEBUG=1일 때만 켬
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1')
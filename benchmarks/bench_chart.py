@@ -0,0 +1,89 @@
+# 그래프 렌더링 벤치마크: 기존 pyplot 방식과 chart 모듈(템플릿 + LRU 캐시)의 초당 요청 수 비교
+#
+#   python benchmarks/bench_chart.py [요청 수]
+import io, base64, os, random, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import chart
+from app import app
+
+
+def legacy_render(initial_bac, T_end):
+    # 기존 index()의 렌더링 코드 (요청마다 pyplot Figure 생성 + bbox_inches="tight")
+    times = np.linspace(0, T_end, 100)
+    bac_values = [max(initial_bac - 0.015 * t, 0) for t in times]
+    plt.figure(figsize=(6,4))
+    plt.plot(times, bac_values, label="BAC")
+    plt.axhline(y=0.03, color='green', linestyle='--', label="Safe Limit (0.03%)")
+    plt.xlabel("Time (hours)")
+    plt.ylabel("Blood Alcohol Concentration (%)")
+    plt.title("BAC over Time")
+    plt.legend()
+    plt.grid(True)
+    buf = io.BytesIO()
+    plt.savefig(buf, format="png", bbox_inches="tight")
+    plt.close()
+    return base64.b64encode(buf.getvalue()).decode("utf-8")
+
+
+def curve_params(n, distinct):
+    # distinct 종류의 곡선이 반복되는 요청 흐름
+    rng = random.Random(0)
+    pool = []
+    for _ in range(distinct):
+        initial_bac = rng.uniform(0.01, 0.25)
+        time_to_safe = max(initial_bac - 0.03, 0) / 0.015
+        pool.append((initial_bac, time_to_safe + 1 if time_to_safe > 0 else 1))
+    return [pool[rng.randrange(distinct)] for _ in range(n)]
+
+
+def rate(func, params):
+    start = time.perf_counter()
+    for initial_bac, T_end in params:
+        func(initial_bac, T_end)
+    return len(params) / (time.perf_counter() - start)
+
+
+def form_posts(n):
+    rng = random.Random(1)
+    return [{
+        'gender': rng.choice(['male', 'female']),
+        'weight': str(rng.randrange(45, 100)),
+        'hours': str(rng.randrange(0, 6)),
+        'soju': str(rng.randrange(0, 3)),
+        'beer': str(rng.randrange(0, 4)),
+        'wine': '0', 'makgeolli': '0', 'whiskey': '0',
+    } for _ in range(n)]
+
+
+def request_rate(posts):
+    client = app.test_client()
+    start = time.perf_counter()
+    for data in posts:
+        client.post('/', data=data)
+    return len(posts) / (time.perf_counter() - start)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    params = curve_params(n, distinct=max(n // 10, 1))
+
+    print(f"렌더링 {n}회 (서로 다른 곡선 {max(n // 10, 1)}개)")
+    print(f"  before  pyplot + bbox_inches=tight : {rate(legacy_render, params):8.1f} req/s")
+    chart.cache_clear()
+    print(f"  after   template, cold cache       : {rate(chart.render_bac_chart, params):8.1f} req/s")
+    print(f"  after   template, warm cache       : {rate(chart.render_bac_chart, params):8.1f} req/s")
+    print(f"  {chart.cache_info()}")
+
+    chart.cache_clear()
+    print(f"POST / {n}회 (test client)       : {request_rate(form_posts(n)):8.1f} req/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# engine 모듈 마이크로벤치마크: 한 사람 계산(compute_bac)과 대량 계산(compute_bac_batch, iter_bac_batch)
+#
+#   python benchmarks/bench_engine.py
+import os, sys, timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import catalog
+import engine
+
+N = 100000
+
+
+def bench_single():
+    counts = {'soju': 1, 'beer': 2, 'whiskey': 1}
+    return lambda: engine.compute_bac('male', 70.0, 1.5, counts)
+
+
+def bench_batch():
+    rng = np.random.default_rng(0)
+    gender = rng.random(N) < 0.5
+    weight = rng.uniform(45, 100, N)
+    hours = rng.uniform(0, 6, N)
+    drinks = rng.integers(0, 4, (N, len(catalog.current())))
+    return lambda: engine.compute_bac_batch(gender, weight, hours, drinks)
+
+
+def bench_stream():
+    rows = [{'gender': 'male', 'weight': '70', 'hours': '1', 'soju': '1', 'beer': '2'}] * N
+    return lambda: sum(len(batch['bac']) for batch in engine.iter_bac_batch(rows))
+
+
+BENCHMARKS = [
+    ('compute_bac (1명)', bench_single, 1),
+    (f'compute_bac_batch ({N}명, 배열)', bench_batch, N),
+    (f'iter_bac_batch ({N}행, dict 스트림)', bench_stream, N),
+]
+
+
+def main():
+    for name, setup, rows in BENCHMARKS:
+        func = setup()
+        number, _ = timeit.Timer(func).autorange()
+        best = min(timeit.repeat(func, number=number, repeat=5)) / number
+        print(f"{name:40s} {best * 1e6:12.2f} us/call {rows / best:14,.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
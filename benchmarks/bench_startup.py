@@ -0,0 +1,50 @@
+# 시작 시간 벤치마크: `python -X importtime`으로 app import 비용과 RSS를 측정
+#
+#   python benchmarks/bench_startup.py [반복 횟수]
+import os, re, subprocess, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ('import app (지연 로딩)', "import app"),
+    ('import app + warm_up()', "import app; app.warm_up()"),
+]
+
+# "import time: self | cumulative | 이름" (이름 앞 공백 수가 중첩 깊이)
+IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def run(code):
+    # 자식 프로세스의 최대 RSS는 RUSAGE_CHILDREN의 누적 최댓값이므로 측정용 래퍼에서 직접 기록
+    wrapper = f"import resource; {code}; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", wrapper],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    modules = []
+    for line in proc.stderr.splitlines():
+        m = IMPORTTIME.match(line)
+        if m and m.group(3) == ' ':
+            # 최상위 import만 (누적 시간)
+            modules.append((int(m.group(2)), m.group(4)))
+    rss_kb = int(proc.stdout.split()[-1])
+    return wall, sum(us for us, _ in modules), rss_kb, sorted(modules, reverse=True)
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for name, code in CASES:
+        runs = [run(code) for _ in range(repeat)]
+        wall = min(r[0] for r in runs)
+        imports = min(r[1] for r in runs)
+        rss = min(r[2] for r in runs)
+        print(f"{name}")
+        print(f"  wall {wall * 1000:8.1f} ms   imports {imports / 1000:8.1f} ms   max RSS {rss / 1024:6.1f} MB")
+        for us, module in runs[-1][3][:5]:
+            print(f"    {us / 1000:8.1f} ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
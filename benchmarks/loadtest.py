@@ -0,0 +1,133 @@
+# 부하 테스트: 실제 사용과 비슷한 요청 흐름으로 앱을 구동하고 처리량과 p50/p99 지연 시간을 출력
+#
+#   python benchmarks/loadtest.py                                  # Flask test client (서버 없이)
+#   python benchmarks/loadtest.py --url http://127.0.0.1:8000      # 실행 중인 로컬 서버
+#
+# 한 세션 = 첫 화면 GET → 측정 POST → 결과 페이지의 그래프 GET.
+# 시드가 고정되어 있어 같은 옵션이면 항상 같은 요청 흐름을 재현함.
+import argparse, os, random, re, sys, threading, time
+import urllib.parse, urllib.request, urllib.error
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+GRAPH_URL = re.compile(r'<img src="([^"]+)"')
+
+# 주류별 (섭취할 확률, 최대 횟수)
+DRINK_MIX = {
+    'soju': (0.6, 3),
+    'beer': (0.6, 5),
+    'wine': (0.15, 3),
+    'makgeolli': (0.15, 3),
+    'whiskey': (0.1, 6),
+}
+
+
+def make_sessions(n, seed):
+    rng = random.Random(seed)
+    sessions = []
+    for _ in range(n):
+        form = {
+            'gender': rng.choice(['male', 'female']),
+            'weight': f"{rng.gauss(68, 12):.1f}",
+            'hours': f"{rng.choice([0, 0.5, 1, 1.5, 2, 3, 4, 6]):g}",
+        }
+        for key, (prob, most) in DRINK_MIX.items():
+            form[key] = str(rng.randint(1, most)) if rng.random() < prob else '0'
+        sessions.append(form)
+    return sessions
+
+
+class TestClientDriver:
+    def __init__(self):
+        from app import app
+        self.app = app
+
+    def request(self, method, path, data=None):
+        # test client는 스레드 간 공유하지 않음
+        client = self.app.test_client()
+        response = client.open(path, method=method, data=data)
+        return response.status_code, response.get_data(as_text=True)
+
+
+class HttpDriver:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with urllib.request.urlopen(req) as response:
+                return response.status, response.read().decode('utf-8', 'replace')
+        except urllib.error.HTTPError as e:
+            return e.code, ""
+
+
+def run(driver, sessions, concurrency):
+    latencies = defaultdict(list)
+    statuses = defaultdict(int)
+    lock = threading.Lock()
+    queue = iter(sessions)
+
+    def timed(kind, method, path, data=None):
+        start = time.perf_counter()
+        status, body = driver.request(method, path, data)
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies[kind].append(elapsed)
+            latencies['all'].append(elapsed)
+            statuses[status] += 1
+        return body
+
+    def worker():
+        while True:
+            with lock:
+                form = next(queue, None)
+            if form is None:
+                return
+            timed('GET /', 'GET', '/')
+            page = timed('POST /', 'POST', '/', form)
+            m = GRAPH_URL.search(page)
+            if m:
+                timed('GET /graph', 'GET', m.group(1).replace('&amp;', '&'))
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, latencies, statuses
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="calcul-alcohol load test")
+    parser.add_argument('--url', help="대상 서버 주소 (생략하면 Flask test client)")
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    driver = HttpDriver(args.url) if args.url else TestClientDriver()
+    wall, latencies, statuses = run(driver, make_sessions(args.sessions, args.seed), args.concurrency)
+
+    total = len(latencies['all'])
+    print(f"{total} requests in {wall:.2f} s, concurrency {args.concurrency}: {total / wall:.1f} req/s")
+    print(f"status: {dict(sorted(statuses.items()))}")
+    print(f"{'':12s} {'count':>7s} {'p50 ms':>9s} {'p90 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}")
+    for kind in ('GET /', 'POST /', 'GET /graph', 'all'):
+        values = latencies[kind]
+        if values:
+            print(f"{kind:12s} {len(values):7d} " + " ".join(
+                f"{percentile(values, p) * 1000:9.2f}" for p in (50, 90, 99, 100)
+            ))
+
+
+if __name__ == '__main__':
+    main()
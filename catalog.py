@@ -0,0 +1,134 @@
+import os, csv, json, threading, time, logging
+from array import array
+
+log = logging.getLogger(__name__)
+
+# 에탄올 밀도 (g/mL): 카탈로그에 grams가 없으면 용량 × 도수 × 밀도로 계산
+ETHANOL_DENSITY = 0.789
+
+# 카탈로그 파일의 변경 여부(mtime)를 확인하는 최소 간격 (초)
+CHECK_INTERVAL = 1.0
+
+# 폼/대량 계산 행에서 주류가 아닌 입력값으로 쓰는 필드 이름 (주류 키로 쓸 수 없음)
+RESERVED_KEYS = frozenset(('gender', 'weight', 'hours'))
+
+# 기본 주류 정보: 키, 이름, 용량(mL), 도수(%), 단위당 알콜 그램
+DEFAULT_DRINKS = [
+    ('soju', "소주", 360, 20, 56.8),
+    ('beer', "맥주", 500, 4.5, 17.75),
+    ('wine', "와인", 150, 12, 14.2),
+    ('makgeolli', "막걸리", 300, 6, 14.2),
+    ('whiskey', "양주", 30, 40, 9.5),
+]
+
+
+class Catalog:
+    # 주류 카탈로그: 항목별 값을 평행 배열로 보관 (i번째 주류 = keys[i], grams[i], ...)
+    # index는 키 → 배열 위치. 요청에서 들어온 필드만 찾아보면 되므로 카탈로그 크기와 무관
+    __slots__ = ('keys', 'index', 'names', 'volumes', 'abvs', 'grams', '_grams_array')
+
+    def __init__(self, entries):
+        entries = list(entries)
+        self.keys = tuple(entry[0] for entry in entries)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        if len(self.index) != len(self.keys):
+            raise ValueError("duplicate drink key in catalog")
+        reserved = RESERVED_KEYS.intersection(self.index)
+        if reserved:
+            raise ValueError(f"reserved drink key in catalog: {', '.join(sorted(reserved))}")
+        self.names = tuple(entry[1] for entry in entries)
+        self.volumes = array('d', (entry[2] for entry in entries))
+        self.abvs = array('d', (entry[3] for entry in entries))
+        self.grams = array('d', (entry[4] for entry in entries))
+        self._grams_array = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def volume_text(self, i):
+        return f"{self.volumes[i]:g} mL"
+
+    def abv_text(self, i):
+        return f"{self.abvs[i]:g}%"
+
+    def grams_array(self):
+        # 대량 계산용 NumPy 배열 (grams 배열을 복사 없이 공유)
+        if self._grams_array is None:
+            import numpy as np
+            self._grams_array = np.frombuffer(self.grams, dtype=float)
+        return self._grams_array
+
+
+def _entry(key, item):
+    volume = float(item['volume_ml'])
+    abv = float(item['abv'])
+    grams = item.get('grams')
+    grams = float(grams) if grams not in (None, '') else volume * abv / 100 * ETHANOL_DENSITY
+    return key, item.get('name') or key, volume, abv, grams
+
+
+# JSON: [{"key", "name", "volume_ml", "abv", "grams"(생략 가능)}, ...] 또는 {키: {...}, ...}
+# CSV: key,name,volume_ml,abv[,grams] 헤더가 있는 표
+def load_catalog(path):
+    if path.endswith('.csv'):
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            result = Catalog(_entry(row['key'], row) for row in csv.DictReader(f))
+    else:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            result = Catalog(_entry(key, item) for key, item in data.items())
+        else:
+            result = Catalog(_entry(item['key'], item) for item in data)
+    # 빈 카탈로그는 잘못된 파일로 간주 (쓰는 중인 파일 등)
+    if not len(result):
+        raise ValueError("empty drink catalog")
+    return result
+
+
+class CatalogSource:
+    # 파일에서 읽은 카탈로그. mtime이 바뀌면 워커 재시작 없이 다시 읽음
+    # 잘못된 파일(쓰는 중 등)이면 기존 카탈로그를 유지하고, 그 mtime은 기억해 두었다가
+    # 파일이 다시 바뀌었을 때만 다시 시도 (고칠 때까지 매번 읽고 경고를 남기지 않도록)
+    def __init__(self, path, check_interval=CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = os.stat(path).st_mtime_ns
+        # 마지막으로 읽기에 실패한 파일의 mtime (파일이 없으면 None, 실패한 적이 없으면 -1)
+        self._failed_mtime = -1
+        self._catalog = load_catalog(path)
+        self._checked = time.monotonic()
+
+    def get(self):
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval and self._lock.acquire(blocking=False):
+            mtime = None
+            try:
+                self._checked = now
+                mtime = os.stat(self.path).st_mtime_ns
+                if mtime != self._mtime and mtime != self._failed_mtime:
+                    self._catalog = load_catalog(self.path)
+                    self._mtime = mtime
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                if mtime != self._failed_mtime:
+                    log.warning("failed to reload drink catalog %s: %s", self.path, e)
+                self._failed_mtime = mtime
+            finally:
+                self._lock.release()
+        return self._catalog
+
+
+DEFAULT_CATALOG = Catalog(DEFAULT_DRINKS)
+
+_source = None
+
+
+def configure(path):
+    # 카탈로그 파일 지정 (None이면 기본 카탈로그)
+    global _source
+    _source = CatalogSource(path) if path else None
+
+
+def current():
+    return _source.get() if _source is not None else DEFAULT_CATALOG
@@ -0,0 +1,219 @@
+import io, hashlib, threading, multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+from engine import SAFE_THRESHOLD, curve_breakpoints
+
+# 캐시 키 양자화 단위: BAC는 0.0001%, 시간은 0.01시간 단위로 반올림
+BAC_QUANTUM = 4
+TIME_QUANTUM = 2
+
+# 그래프로 그릴 수 있는 입력 범위: initial_bac는 [0, MAX_BAC), T_end는 (0, MAX_HOURS]
+# /graph와 /api/curve가 받는 값이자 결과 페이지에 그래프를 넣는 조건
+MAX_BAC = 10
+MAX_HOURS = 1000
+
+# 렌더링 결과 LRU 캐시 크기 (항목당 이미지 수십 KB)
+CACHE_SIZE = 256
+
+# 그래프/곡선 응답 형식의 버전. 그리는 방식이나 /api/curve 응답 형태를 바꾸면 올려야 함
+# (URL의 v=와 ETag가 바뀌어 브라우저/CDN에 1년간 캐시된 이전 결과를 쓰지 않게 됨)
+RENDER_VERSION = 2
+
+# 지원하는 출력 형식과 MIME 타입
+FORMATS = {
+    'svg': 'image/svg+xml',
+    'png': 'image/png',
+}
+
+# 렌더링을 기다리는 최대 시간 (초). 넘기면 Overloaded로 처리
+RENDER_TIMEOUT = 5.0
+
+# Figure 객체는 스레드 안전하지 않으므로 스레드마다 템플릿을 하나씩 만들어 재사용
+_local = threading.local()
+
+
+def _build_template():
+    # matplotlib는 import 비용이 크므로 처음 그래프를 그릴 때 불러옴
+    import matplotlib
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    # SVG는 글자를 path 대신 텍스트로 남겨 용량을 줄이고, 요소 id를 고정해 출력이 결정적이도록 함
+    matplotlib.rcParams['svg.fonttype'] = 'none'
+    matplotlib.rcParams['svg.hashsalt'] = 'calcul-alcohol'
+
+    # pyplot 전역 상태를 쓰지 않고 Figure/Agg API로 직접 생성
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    line, = ax.plot([0, 1], [0, 0], label="BAC")
+    ax.axhline(y=SAFE_THRESHOLD, color='green', linestyle='--', label="Safe Limit (0.03%)")
+    ax.set_xlabel("Time (hours)")
+    ax.set_ylabel("Blood Alcohol Concentration (%)")
+    ax.set_title("BAC over Time")
+    ax.legend()
+    ax.grid(True)
+    # bbox_inches="tight"는 매번 레이아웃을 다시 계산하므로 여백을 한 번만 고정
+    fig.tight_layout()
+    return fig, ax, line
+
+
+def _template():
+    tpl = getattr(_local, 'template', None)
+    if tpl is None:
+        tpl = _local.template = _build_template()
+    return tpl
+
+
+def bac_curve(initial_bac, T_end):
+    # 곡선은 꺾은선이므로 샘플링 없이 꺾은점만으로 그림
+    points = curve_breakpoints(initial_bac, T_end)
+    return [t for t, _ in points], [bac for _, bac in points]
+
+
+def quantize(initial_bac, T_end):
+    # 그래프는 (initial_bac, T_end)에만 의존하므로 양자화한 값을 캐시 키로 사용
+    return round(initial_bac, BAC_QUANTUM), round(T_end, TIME_QUANTUM)
+
+
+def in_range(initial_bac, T_end):
+    return 0 <= initial_bac < MAX_BAC and 0 < T_end <= MAX_HOURS
+
+
+def content_hash(initial_bac, T_end, fmt=''):
+    # 같은 입력이면 어느 워커에서든 같은 값 (ETag 및 URL 식별자)
+    initial_bac, T_end = quantize(initial_bac, T_end)
+    key = f"{RENDER_VERSION}:{initial_bac:.{BAC_QUANTUM}f}:{T_end:.{TIME_QUANTUM}f}:{fmt}"
+    return hashlib.sha1(key.encode("ascii")).hexdigest()[:16]
+
+
+class Overloaded(Exception):
+    # 렌더링 대기열이 가득 찼거나 RENDER_TIMEOUT 안에 끝나지 않음
+    pass
+
+
+# 렌더링 프로세스 풀 설정 (configure_pool). 워커 수가 0이면 요청 스레드에서 바로 렌더링
+_pool_workers = 0
+_pool_slots = None
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure_pool(workers, max_pending):
+    # 동시에 처리 중이거나 기다리는 렌더링은 workers + max_pending개까지만 허용
+    # 풀 자체는 처음 사용할 때 만들어지므로 fork 전(마스터)에서 호출해도 안전
+    global _pool_workers, _pool_slots
+    _pool_workers = workers
+    _pool_slots = threading.BoundedSemaphore(workers + max_pending) if workers > 0 else None
+
+
+def _get_pool():
+    # 요청 스레드가 여럿인 워커에서 fork하면 다른 스레드가 잡고 있던 락(logging, 폰트 캐시 등)이
+    # 자식에서 풀리지 않아 멈출 수 있으므로 forkserver로 렌더링 프로세스를 만듦.
+    # 대신 렌더링 프로세스는 워커의 상태를 물려받지 못하므로 matplotlib는 forkserver에서 한 번 불러 둠
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            ctx = multiprocessing.get_context('forkserver')
+            ctx.set_forkserver_preload(['chart', 'matplotlib.figure', 'matplotlib.backends.backend_agg'])
+            _pool = ProcessPoolExecutor(max_workers=_pool_workers, mp_context=ctx)
+        return _pool
+
+
+def _discard_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _draw(initial_bac, T_end, fmt):
+    fig, ax, line = _template()
+    line.set_data(*bac_curve(initial_bac, T_end))
+    ax.relim()
+    ax.autoscale_view()
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, metadata={'Date': None} if fmt == 'svg' else None)
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _render(initial_bac, T_end, fmt):
+    if _pool_slots is None:
+        return _draw(initial_bac, T_end, fmt)
+    # 대기열이 가득 차면 기다리지 않고 바로 거절 (backpressure)
+    if not _pool_slots.acquire(blocking=False):
+        raise Overloaded
+    try:
+        future = _get_pool().submit(_draw, initial_bac, T_end, fmt)
+    except BrokenProcessPool:
+        _pool_slots.release()
+        _discard_pool()
+        raise Overloaded
+    except BaseException:
+        _pool_slots.release()
+        raise
+    # 시간 초과로 포기해도 슬롯은 실제 렌더링이 끝날 때 반환
+    future.add_done_callback(lambda f: _pool_slots.release())
+    try:
+        return future.result(timeout=RENDER_TIMEOUT)
+    except TimeoutError:
+        raise Overloaded
+    except BrokenProcessPool:
+        # 렌더링 프로세스가 죽으면 풀을 버리고 다음 요청에서 새로 만듦
+        _discard_pool()
+        raise Overloaded
+
+
+def render_bac_chart(initial_bac, T_end, fmt='png'):
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported chart format: {fmt}")
+    return _render(*quantize(initial_bac, T_end), fmt)
+
+
+def fallback_svg(initial_bac, T_end):
+    # 과부하 시 대신 보내는 간이 그래프: matplotlib 없이 꺾은선 SVG를 직접 만듦
+    width, height, pad = 600, 400, 40
+    y_max = max(initial_bac, SAFE_THRESHOLD) * 1.1
+
+    def point(t, b):
+        return f"{pad + t / T_end * (width - 2 * pad):.1f},{height - pad - b / y_max * (height - 2 * pad):.1f}"
+
+    curve = " ".join(point(t, b) for t, b in curve_breakpoints(initial_bac, T_end))
+    safe = f"{point(0, SAFE_THRESHOLD)} {point(T_end, SAFE_THRESHOLD)}"
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<rect x="{pad}" y="{pad}" width="{width - 2 * pad}" height="{height - 2 * pad}" fill="none" stroke="#ccc"/>'
+        f'<polyline points="{curve}" fill="none" stroke="#1f77b4" stroke-width="2"/>'
+        f'<polyline points="{safe}" fill="none" stroke="green" stroke-dasharray="6,4"/>'
+        f'<text x="{width / 2}" y="{pad - 12}" text-anchor="middle" font-family="sans-serif">BAC over Time</text>'
+        f'<text x="{pad}" y="{height - 12}" font-family="sans-serif" font-size="12">0 h</text>'
+        f'<text x="{width - pad}" y="{height - 12}" text-anchor="end" font-family="sans-serif" font-size="12">{T_end:g} h</text>'
+        '</svg>'
+    ).encode("utf-8")
+
+
+def cache_info():
+    return _render.cache_info()
+
+
+def cache_clear():
+    _render.cache_clear()
+
+
+# NumPy/matplotlib import와 폰트 캐시를 미리 준비하는 훅
+# fork 전에 마스터에서 호출하면 워커들이 이 상태를 copy-on-write로 공유
+# (그래프 템플릿은 스레드별이라 공유할 수 없으므로 각 요청 스레드가 처음 그릴 때 만듦)
+# 렌더링 프로세스 풀을 쓰면 웹 워커는 그래프를 그리지 않고, 렌더링 프로세스는 forkserver에서
+# 만들어져 이 상태를 물려받지 못하므로 대량 계산에 쓰는 NumPy만 불러옴
+def warm_up():
+    import numpy
+    if _pool_workers > 0:
+        return
+    import matplotlib.figure
+    import matplotlib.backends.backend_agg
+    from matplotlib import font_manager
+    font_manager.get_font(font_manager.findfont(font_manager.FontProperties()))
@@ -0,0 +1,199 @@
+from bisect import bisect_right
+from itertools import islice
+
+import catalog as drink_catalog
+
+# 성별에 따른 알콜 분포율: 남성 0.68, 여성 0.55
+R_MALE = 0.68
+R_FEMALE = 0.55
+
+# 시간당 알콜 분해량 (%/h), 안전 운전 기준 (%)
+ELIMINATION_RATE = 0.015
+SAFE_THRESHOLD = 0.03
+
+# 처벌 기준 (예시): PENALTY_THRESHOLDS[i] 이상이면 PENALTIES[i + 1]
+PENALTY_THRESHOLDS = (0.03, 0.08, 0.15)
+PENALTIES = (
+    "운전해도 괜찮습니다.",
+    "징역 1년, 벌금 200만원, 면허 취소 6개월",
+    "징역 2년, 벌금 500만원, 면허 취소 1년",
+    "징역 3년, 벌금 1000만원, 면허 취소 2년",
+)
+
+# 대량 계산 시 한 번에 배열로 변환하는 행 수 (메모리 사용량 상한)
+BATCH_CHUNK = 10000
+
+# 대량 계산 결과 열: 처벌 기준별로 BAC가 그 아래로 떨어지는 시각(시간)도 함께 반환
+CROSSING_COLUMNS = tuple(f"time_below_{threshold:g}" for threshold in PENALTY_THRESHOLDS)
+BATCH_COLUMNS = (
+    'total_alcohol', 'initial_bac', 'bac', 'time_to_safe', 'penalty', *CROSSING_COLUMNS, 'time_to_zero'
+)
+
+
+# BAC 곡선은 initial_bac에서 시간당 ELIMINATION_RATE씩 줄다가 0에서 멈추는 꺾은선이므로
+# 샘플링하지 않고 해석적으로 계산
+def bac_at(initial_bac, t):
+    return max(initial_bac - ELIMINATION_RATE * t, 0.0)
+
+
+# BAC가 threshold 아래로 떨어지는 시각 (처음부터 아래면 0)
+def time_below(initial_bac, threshold):
+    return max(initial_bac - threshold, 0) / ELIMINATION_RATE
+
+
+# 곡선의 꺾은점 목록 [(시간, BAC), ...]: 시작점, 처벌 기준을 지나는 점, BAC가 0이 되는 점
+# T_end를 주면 그 시각에서 잘라 끝점을 붙임
+def curve_breakpoints(initial_bac, T_end=None):
+    points = [(0.0, initial_bac)]
+    for threshold in reversed(PENALTY_THRESHOLDS):
+        if threshold < initial_bac:
+            points.append((time_below(initial_bac, threshold), threshold))
+    if initial_bac > 0:
+        points.append((initial_bac / ELIMINATION_RATE, 0.0))
+    if T_end is not None:
+        points = [point for point in points if point[0] < T_end]
+        points.append((T_end, bac_at(initial_bac, T_end)))
+    return points
+
+
+class BacResult:
+    # 한 사람의 계산 결과 (penalty는 PENALTIES의 인덱스, grams는 주류 키 → 알콜 그램,
+    # crossings는 PENALTY_THRESHOLDS 순서로 각 기준 아래로 떨어지는 시각)
+    __slots__ = ('grams', 'total_alcohol', 'initial_bac', 'bac', 'time_to_safe', 'penalty', 'crossings', 'time_to_zero')
+
+    grams: dict
+    total_alcohol: float
+    initial_bac: float
+    bac: float
+    time_to_safe: float
+    penalty: int
+    crossings: tuple
+    time_to_zero: float
+
+    def __init__(self, grams, total_alcohol, initial_bac, bac, time_to_safe, penalty, crossings, time_to_zero):
+        self.grams = grams
+        self.total_alcohol = total_alcohol
+        self.initial_bac = initial_bac
+        self.bac = bac
+        self.time_to_safe = time_to_safe
+        self.penalty = penalty
+        self.crossings = crossings
+        self.time_to_zero = time_to_zero
+
+    @property
+    def penalty_text(self):
+        return PENALTIES[self.penalty]
+
+    @property
+    def breakpoints(self):
+        return curve_breakpoints(self.initial_bac)
+
+    def __repr__(self):
+        return (
+            f"BacResult(total_alcohol={self.total_alcohol!r}, initial_bac={self.initial_bac!r}, "
+            f"bac={self.bac!r}, time_to_safe={self.time_to_safe!r}, penalty={self.penalty!r})"
+        )
+
+
+# 한 사람의 BAC 계산
+# counts: 주류 키 → 섭취 횟수 (마신 주류만 있으면 됨). catalog를 생략하면 현재 카탈로그 사용
+def compute_bac(gender, weight, hours, counts, catalog=None):
+    if catalog is None:
+        catalog = drink_catalog.current()
+    index, grams_table = catalog.index, catalog.grams
+    grams = {key: count * grams_table[index[key]] for key, count in counts.items()}
+    total_alcohol = sum(grams.values())
+    r = R_MALE if gender == 'male' else R_FEMALE
+    # 초기 BAC (마신 직후, 소모 전)
+    initial_bac = (total_alcohol / (weight * 1000 * r)) * 100
+    # 경과 시간에 따른 현재 BAC (음수가 되면 0으로 처리)
+    bac = max(initial_bac - ELIMINATION_RATE * hours, 0)
+    # 각 처벌 기준 및 안전 기준 아래로 떨어질 때까지 필요한 시간 (시간 단위)
+    crossings = tuple(time_below(initial_bac, threshold) for threshold in PENALTY_THRESHOLDS)
+    time_to_safe = time_below(initial_bac, SAFE_THRESHOLD)
+    penalty = bisect_right(PENALTY_THRESHOLDS, bac)
+    return BacResult(
+        grams, total_alcohol, initial_bac, bac, time_to_safe, penalty, crossings, initial_bac / ELIMINATION_RATE
+    )
+
+
+# 여러 사람의 BAC를 배열 연산으로 한 번에 계산
+# gender: 'male'/'female' 문자열 배열 또는 남성 여부 bool 배열
+# drinks: (행 수 × 카탈로그 주류 수) 섭취 횟수 행렬, 열 순서는 catalog.keys
+# 반환값의 penalty는 PENALTIES의 인덱스
+# NumPy는 대량 계산에서만 필요하므로 함수 안에서 불러옴 (한 사람 계산은 순수 파이썬)
+def compute_bac_batch(gender, weight, hours, drinks, catalog=None):
+    import numpy as np
+
+    if catalog is None:
+        catalog = drink_catalog.current()
+
+    gender = np.asarray(gender)
+    is_male = gender if gender.dtype == bool else gender == 'male'
+    weight = np.asarray(weight, dtype=float)
+    hours = np.asarray(hours, dtype=float)
+    # 1차원이면 한 사람의 행으로 보고, 열 수가 카탈로그와 다르면 거절
+    drinks = np.atleast_2d(np.asarray(drinks, dtype=float))
+    if drinks.ndim != 2 or drinks.shape[-1] != len(catalog):
+        raise ValueError(f"drinks must have {len(catalog)} columns (one per catalog drink), got shape {drinks.shape}")
+    # 몸무게 0/음수/NaN이면 BAC가 inf/NaN이 되므로 거절 (경과 시간은 0 이상, 섭취 횟수는 유한한 값)
+    if not (np.isfinite(weight).all() and (weight > 0).all()):
+        raise ValueError("weight must be a positive number")
+    if not (np.isfinite(hours).all() and (hours >= 0).all()):
+        raise ValueError("hours must be a non-negative number")
+    if not np.isfinite(drinks).all():
+        raise ValueError("drink counts must be finite numbers")
+
+    total_alcohol = drinks @ catalog.grams_array()
+    r = np.where(is_male, R_MALE, R_FEMALE)
+    initial_bac = total_alcohol / (weight * 1000 * r) * 100
+    bac = np.maximum(initial_bac - ELIMINATION_RATE * hours, 0)
+    time_to_safe = np.maximum(initial_bac - SAFE_THRESHOLD, 0) / ELIMINATION_RATE
+    penalty = np.searchsorted(PENALTY_THRESHOLDS, bac, side='right')
+    crossings = np.maximum(initial_bac[:, None] - np.asarray(PENALTY_THRESHOLDS), 0) / ELIMINATION_RATE
+    return {
+        'total_alcohol': total_alcohol,
+        'initial_bac': initial_bac,
+        'bac': bac,
+        'time_to_safe': time_to_safe,
+        'penalty': penalty,
+        **dict(zip(CROSSING_COLUMNS, crossings.T)),
+        'time_to_zero': initial_bac / ELIMINATION_RATE,
+    }
+
+
+def _rows_to_arrays(rows, catalog):
+    import numpy as np
+
+    # 폼/CSV/JSON 행(dict) 목록을 compute_bac_batch 인자로 변환
+    # 주류는 행에 실제로 있는 값만 찾아서 채움 (빈 칸/없는 주류는 0회)
+    n = len(rows)
+    gender = np.fromiter((row.get('gender') == 'male' for row in rows), bool, n)
+    weight = np.fromiter((float(row['weight']) for row in rows), float, n)
+    hours = np.fromiter((float(row['hours']) for row in rows), float, n)
+    index = catalog.index
+    cells = [
+        (i, index[key], value)
+        for i, row in enumerate(rows)
+        for key, value in row.items()
+        if value and key in index
+    ]
+    drinks = np.zeros((n, len(catalog)))
+    if cells:
+        row_idx, col_idx, values = zip(*cells)
+        drinks[row_idx, col_idx] = np.array(values, dtype=float)
+    return gender, weight, hours, drinks
+
+
+# 행(dict) 이터러블을 chunk_size씩 끊어 계산한 결과를 차례로 반환
+# 입력 전체를 메모리에 올리지 않으므로 수백만 행도 일정한 메모리로 처리 가능
+# 처리 도중 카탈로그가 바뀌어도 결과가 섞이지 않도록 시작 시점의 카탈로그를 끝까지 사용
+def iter_bac_batch(rows, chunk_size=BATCH_CHUNK, catalog=None):
+    if catalog is None:
+        catalog = drink_catalog.current()
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield compute_bac_batch(*_rows_to_arrays(chunk, catalog), catalog=catalog)
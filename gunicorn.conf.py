@@ -0,0 +1,42 @@
+# gunicorn 설정 (운영 환경)
+#
+#   gunicorn -c gunicorn.conf.py app:app
+#
+# preload 모드(기본값)에서는 마스터가 app을 불러오고 warm_up()으로 NumPy를 불러온 뒤
+# 워커를 fork하므로, 워커들은 이 상태를 copy-on-write로 공유함.
+# 그래프는 렌더링 프로세스 풀에서 그리므로 웹 워커에는 matplotlib가 필요 없음. 렌더링 프로세스는
+# 워커마다 forkserver에서 만들어지며 matplotlib import는 forkserver 것을 공유하고 폰트는 각자 읽음.
+# CALCUL_RENDER_WORKERS=0이면 워커가 직접 그리므로 warm_up()이 matplotlib와 폰트 캐시까지 준비함.
+# CALCUL_PRELOAD=0이면 워커마다 app을 따로 불러오고 무거운 모듈은 첫 사용 시 지연 로딩.
+#
+# 그래프 렌더링은 워커마다 CALCUL_RENDER_WORKERS개의 프로세스 풀로 넘기므로 요청 스레드를
+# 막지 않음. 대기열(CALCUL_RENDER_QUEUE)이 가득 차면 간이 그래프(SVG) 또는 503으로 바로 응답.
+import os, glob, tempfile
+
+bind = os.environ.get('BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = 'gthread'
+threads = int(os.environ.get('THREADS', 4))
+preload_app = os.environ.get('CALCUL_PRELOAD', '1') == '1'
+
+# app import 전에 설정해야 하므로 환경 변수로 전달
+os.environ.setdefault('CALCUL_RENDER_WORKERS', '2')
+os.environ.setdefault('CALCUL_RENDER_QUEUE', '4')
+
+# /metrics가 어느 워커에 가든 같은 값을 보도록 워커들이 지표를 이 디렉터리에 모음
+os.environ.setdefault('CALCUL_METRICS_DIR', os.path.join(tempfile.gettempdir(), f'calcul-metrics-{os.getpid()}'))
+
+
+def on_starting(server):
+    # 이전 실행의 지표 파일이 남아 있으면 그 값까지 더해지므로 시작할 때 지움
+    directory = os.environ['CALCUL_METRICS_DIR']
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        os.remove(path)
+
+
+def when_ready(server):
+    # 워커를 fork하기 직전 마스터에서 실행
+    if preload_app:
+        from app import warm_up
+        warm_up()
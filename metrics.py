@@ -0,0 +1,208 @@
+import os, glob, json, time, atexit, threading, logging
+from bisect import bisect_left
+
+log = logging.getLogger(__name__)
+
+# 히스토그램 구간 경계 (초)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# 워커별 지표 파일을 저장하는 간격 (초)
+DUMP_INTERVAL = 1.0
+
+
+class Histogram:
+    # Prometheus 형식 히스토그램 (구간별 개수는 누적하지 않고 저장, 출력할 때 누적)
+    __slots__ = ('counts', 'sum', 'count', '_lock')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+
+
+# (이름, 라벨) → Histogram / 카운터 값
+_histograms = {}
+_counters = {}
+_lock = threading.Lock()
+
+# 출력 시점에 계산하는 카운터를 돌려주는 함수 목록 (각각 [(이름, 라벨, 값), ...] 반환)
+_collectors = []
+
+# 여러 워커 프로세스(gunicorn)의 값을 합치기 위한 공유 디렉터리 (None이면 이 프로세스 값만 출력)
+# 워커마다 자기 값을 파일 하나에 DUMP_INTERVAL마다 저장하고, /metrics는 모든 파일을 더해서 출력
+# 끝난 워커의 파일도 남겨 두므로 워커가 재시작되어도 카운터가 줄어들지 않음
+_dir = None
+_file = None
+_owner = None
+
+# 이름 → 도움말
+_help = {
+    'calcul_stage_seconds': "Time spent in each request processing stage.",
+    'calcul_request_seconds': "Time to produce a response, by endpoint.",
+    'calcul_events_total': "Counted events (cache revalidations, degraded charts).",
+    'calcul_cache_requests_total': "In-process cache lookups, by cache and result.",
+}
+
+
+def configure(directory):
+    global _dir
+    _dir = directory
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def add_collector(collect):
+    _collectors.append(collect)
+
+
+def observe(name, labels, seconds):
+    key = (name, labels)
+    hist = _histograms.get(key)
+    if hist is None:
+        with _lock:
+            hist = _histograms.setdefault(key, Histogram())
+    hist.observe(seconds)
+    if _dir is not None and _owner != os.getpid():
+        _start_writer()
+
+
+def inc(name, labels, amount=1):
+    key = (name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+    if _dir is not None and _owner != os.getpid():
+        _start_writer()
+
+
+def _start_writer():
+    # fork된 워커에서 처음 기록할 때 자기 파일을 정하고 저장 스레드를 시작
+    global _file, _owner
+    with _lock:
+        if _owner == os.getpid():
+            return
+        _owner = os.getpid()
+        # pid는 재사용될 수 있으므로 시작 시각도 파일 이름에 넣음
+        _file = os.path.join(_dir, f"{_owner}-{time.time_ns()}.json")
+    threading.Thread(target=_writer_loop, daemon=True).start()
+
+
+def _writer_loop():
+    while True:
+        time.sleep(DUMP_INTERVAL)
+        _dump()
+
+
+def _dump():
+    if _owner != os.getpid():
+        return
+    histograms, counters = _snapshot()
+    data = {
+        'histograms': [[name, labels, *values] for (name, labels), values in histograms.items()],
+        'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+    }
+    try:
+        with open(_file + '.tmp', 'w') as f:
+            json.dump(data, f)
+        os.replace(_file + '.tmp', _file)
+    except OSError as e:
+        log.warning("failed to write metrics file %s: %s", _file, e)
+
+
+# 정상 종료할 때 마지막 DUMP_INTERVAL 동안의 값도 남김
+atexit.register(_dump)
+
+
+# 이 프로세스의 값: ({(이름, 라벨): (구간별 개수, 합계, 개수)}, {(이름, 라벨): 값})
+def _snapshot():
+    with _lock:
+        histogram_items = list(_histograms.items())
+        counters = dict(_counters)
+    histograms = {}
+    for key, hist in histogram_items:
+        with hist._lock:
+            histograms[key] = (list(hist.counts), hist.sum, hist.count)
+    for collect in _collectors:
+        for name, labels, value in collect():
+            counters[(name, labels)] = counters.get((name, labels), 0) + value
+    return histograms, counters
+
+
+def _key(name, labels):
+    return name, tuple(tuple(pair) for pair in labels)
+
+
+# 공유 디렉터리의 모든 워커 파일을 읽어 더함 (이 프로세스 값은 방금 저장한 최신 값)
+def _merged():
+    _dump()
+    histograms = {}
+    counters = {}
+    for path in glob.glob(os.path.join(_dir, '*.json')):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, labels, counts, total, count in data['histograms']:
+            key = _key(name, labels)
+            if key in histograms:
+                old_counts, old_total, old_count = histograms[key]
+                counts = [a + b for a, b in zip(old_counts, counts)]
+                total += old_total
+                count += old_count
+            histograms[key] = (counts, total, count)
+        for name, labels, value in data['counters']:
+            key = _key(name, labels)
+            counters[key] = counters.get(key, 0) + value
+    return histograms, counters
+
+
+def _labels(labels, extra=()):
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+# Prometheus 텍스트 형식으로 출력 (공유 디렉터리를 설정했으면 모든 워커의 합계)
+def render():
+    if _dir is not None:
+        if _owner != os.getpid():
+            _start_writer()
+        histograms, counters = _merged()
+    else:
+        histograms, counters = _snapshot()
+    lines = []
+    seen = set()
+    for (name, labels), (counts, total, count) in sorted(histograms.items()):
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# HELP {name} {_help.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, n in zip(BUCKETS, counts):
+            cumulative += n
+            lines.append(f"{name}_bucket{_labels(labels, (('le', f'{bound:g}'),))} {cumulative}")
+        lines.append(f"{name}_bucket{_labels(labels, (('le', '+Inf'),))} {count}")
+        lines.append(f"{name}_sum{_labels(labels)} {total:.6f}")
+        lines.append(f"{name}_count{_labels(labels)} {count}")
+    for (name, labels), value in sorted(counters.items()):
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# HELP {name} {_help.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()